@@ -0,0 +1,111 @@
+-- Server-side aggregates for match_master --------------------------------
+-- Run after master_denorm_dev.sql. Clients call these through PostgREST RPC
+-- (supabase.rpc('leaderboard_summary', {...})) instead of downloading every
+-- row with select=* and aggregating locally.
+
+-- Indexes ------------------------------------------------------------------
+CREATE INDEX IF NOT EXISTS idx_match_master_match_timestamp ON match_master (match_timestamp);
+CREATE INDEX IF NOT EXISTS idx_match_master_map_id ON match_master (map_id);
+CREATE INDEX IF NOT EXISTS idx_match_master_mode_id ON match_master (mode_id);
+
+-- Player leaderboard ---------------------------------------------------------
+-- One row per player name across all eight roster slots. Matches analytics_dev/app.R:
+-- a win is the player's side outscoring the other; losses = matches - wins.
+CREATE OR REPLACE FUNCTION leaderboard_summary(
+    p_since TIMESTAMPTZ DEFAULT NULL,
+    p_until TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (
+    player_name TEXT,
+    matches BIGINT,
+    wins BIGINT,
+    losses BIGINT,
+    win_rate NUMERIC
+)
+LANGUAGE sql STABLE AS $$
+    SELECT
+        slot.player_name,
+        COUNT(*) AS matches,
+        COUNT(*) FILTER (WHERE slot.won) AS wins,
+        COUNT(*) - COUNT(*) FILTER (WHERE slot.won) AS losses,
+        ROUND(COUNT(*) FILTER (WHERE slot.won)::NUMERIC / COUNT(*), 4) AS win_rate
+    FROM match_master AS m
+    CROSS JOIN LATERAL (
+        VALUES
+            (m.guild_player1_name, m.guild_score > m.jsoc_score),
+            (m.guild_player2_name, m.guild_score > m.jsoc_score),
+            (m.guild_player3_name, m.guild_score > m.jsoc_score),
+            (m.guild_player4_name, m.guild_score > m.jsoc_score),
+            (m.jsoc_player1_name, m.jsoc_score > m.guild_score),
+            (m.jsoc_player2_name, m.jsoc_score > m.guild_score),
+            (m.jsoc_player3_name, m.jsoc_score > m.guild_score),
+            (m.jsoc_player4_name, m.jsoc_score > m.guild_score)
+    ) AS slot (player_name, won)
+    WHERE slot.player_name IS NOT NULL
+      AND (p_since IS NULL OR m.match_timestamp >= p_since)
+      AND (p_until IS NULL OR m.match_timestamp < p_until)
+    GROUP BY slot.player_name
+    ORDER BY wins DESC, matches DESC, slot.player_name;
+$$;
+
+-- Mode breakdown -------------------------------------------------------------
+CREATE OR REPLACE FUNCTION mode_summary(
+    p_since TIMESTAMPTZ DEFAULT NULL,
+    p_until TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (
+    mode_id INT,
+    mode_name VARCHAR,
+    matches BIGINT,
+    avg_guild NUMERIC,
+    avg_jsoc NUMERIC,
+    guild_wins BIGINT,
+    jsoc_wins BIGINT
+)
+LANGUAGE sql STABLE AS $$
+    SELECT
+        m.mode_id,
+        modes.mode_name,
+        COUNT(*) AS matches,
+        ROUND(AVG(m.guild_score), 2) AS avg_guild,
+        ROUND(AVG(m.jsoc_score), 2) AS avg_jsoc,
+        COUNT(*) FILTER (WHERE m.guild_score > m.jsoc_score) AS guild_wins,
+        COUNT(*) FILTER (WHERE m.jsoc_score > m.guild_score) AS jsoc_wins
+    FROM match_master AS m
+    LEFT JOIN modes ON modes.mode_id = m.mode_id
+    WHERE (p_since IS NULL OR m.match_timestamp >= p_since)
+      AND (p_until IS NULL OR m.match_timestamp < p_until)
+    GROUP BY m.mode_id, modes.mode_name
+    ORDER BY matches DESC, m.mode_id;
+$$;
+
+-- Map breakdown --------------------------------------------------------------
+CREATE OR REPLACE FUNCTION map_summary(
+    p_since TIMESTAMPTZ DEFAULT NULL,
+    p_until TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (
+    map_id INT,
+    map_name VARCHAR,
+    matches BIGINT,
+    avg_guild NUMERIC,
+    avg_jsoc NUMERIC,
+    guild_wins BIGINT,
+    jsoc_wins BIGINT
+)
+LANGUAGE sql STABLE AS $$
+    SELECT
+        m.map_id,
+        maps.map_name,
+        COUNT(*) AS matches,
+        ROUND(AVG(m.guild_score), 2) AS avg_guild,
+        ROUND(AVG(m.jsoc_score), 2) AS avg_jsoc,
+        COUNT(*) FILTER (WHERE m.guild_score > m.jsoc_score) AS guild_wins,
+        COUNT(*) FILTER (WHERE m.jsoc_score > m.guild_score) AS jsoc_wins
+    FROM match_master AS m
+    LEFT JOIN maps ON maps.map_id = m.map_id
+    WHERE (p_since IS NULL OR m.match_timestamp >= p_since)
+      AND (p_until IS NULL OR m.match_timestamp < p_until)
+    GROUP BY m.map_id, maps.map_name
+    ORDER BY matches DESC, m.map_id;
+$$;
@@ -0,0 +1,185 @@
+"""Benchmark server-side aggregate RPCs against select=* downloads.
+
+Today every consumer pulls all of match_master and aggregates client-side.
+This compares that path with the ``leaderboard_summary``/``mode_summary``/
+``map_summary`` functions from ``db/aggregates_dev.sql`` (mirrored by
+``LocalMatchStore``), checks both produce the same numbers, and reports the
+payload size, local latency and an estimated wire time for each.
+
+Usage:
+    python -m discordbot_dev.aggregates --synthetic 20000
+    python -m discordbot_dev.aggregates --local dev.db --rtt-ms 60 --bandwidth-mbps 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from discordbot_dev.constants import MAPS, MODES
+from discordbot_dev.local_store import LocalMatchStore
+from discordbot_dev.match_flow import PLAYER_NAME_COLUMNS
+
+
+# PostgREST caps a single response at 1000 rows by default.
+PAGE_SIZE = 1000
+
+Rows = List[Dict[str, Any]]
+
+
+def fetch_all(store: LocalMatchStore) -> Tuple[Rows, int]:
+    """Download every row page by page, like a select=* client; returns (rows, requests)."""
+    rows: Rows = []
+    requests = 0
+    while True:
+        batch = store.fetch_matches_after(rows[-1]["entry_id"] if rows else 0, PAGE_SIZE)
+        requests += 1
+        rows.extend(batch)
+        if len(batch) < PAGE_SIZE:
+            return rows, requests
+
+
+def leaderboard_from_rows(rows: Rows) -> Rows:
+    """Client-side equivalent of leaderboard_summary (and app.R's leaderboard)."""
+    totals: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    for row in rows:
+        guild_score, jsoc_score = row.get("guild_score"), row.get("jsoc_score")
+        scored = guild_score is not None and jsoc_score is not None
+        for column in PLAYER_NAME_COLUMNS:
+            name = row.get(column)
+            if not name:
+                continue
+            won = scored and (
+                guild_score > jsoc_score if column.startswith("guild") else jsoc_score > guild_score
+            )
+            totals[name][0] += 1
+            totals[name][1] += int(won)
+    summary = [
+        {
+            "player_name": name,
+            "matches": matches,
+            "wins": wins,
+            "losses": matches - wins,
+            "win_rate": round(wins / matches, 4),
+        }
+        for name, (matches, wins) in totals.items()
+    ]
+    return sorted(summary, key=lambda r: (-r["wins"], -r["matches"], r["player_name"]))
+
+
+def breakdown_from_rows(rows: Rows, key: str, name: str) -> Rows:
+    """Client-side equivalent of mode_summary/map_summary."""
+    groups: Dict[Any, Rows] = defaultdict(list)
+    for row in rows:
+        groups[(row.get(key), row.get(name))].append(row)
+
+    def average(values: List[int]) -> Optional[float]:
+        return round(sum(values) / len(values), 2) if values else None
+
+    summary = []
+    for (group_id, group_name), members in groups.items():
+        guild = [r["guild_score"] for r in members if r.get("guild_score") is not None]
+        jsoc = [r["jsoc_score"] for r in members if r.get("jsoc_score") is not None]
+        scored = [r for r in members if r.get("guild_score") is not None and r.get("jsoc_score") is not None]
+        summary.append(
+            {
+                key: group_id,
+                name: group_name,
+                "matches": len(members),
+                "avg_guild": average(guild),
+                "avg_jsoc": average(jsoc),
+                "guild_wins": sum(r["guild_score"] > r["jsoc_score"] for r in scored),
+                "jsoc_wins": sum(r["jsoc_score"] > r["guild_score"] for r in scored),
+            }
+        )
+    return sorted(summary, key=lambda r: (-r["matches"], r[key] if r[key] is not None else 0))
+
+
+def seed_synthetic(store: LocalMatchStore, n_matches: int, seed: int = 0) -> None:
+    """Fill a store with random matches spread over the last year."""
+    from discordbot_dev.bootstrap_rankings import synthetic_matches
+
+    rng = random.Random(seed)
+    start = datetime.now(timezone.utc) - timedelta(days=365)
+    for i, row in enumerate(synthetic_matches(n_matches, seed=seed)):
+        row.pop("entry_id")
+        row["by_who"] = "synthetic"
+        row["map_id"] = rng.randint(1, len(MAPS))
+        row["mode_id"] = rng.randint(1, len(MODES))
+        row["match_timestamp"] = (start + timedelta(minutes=i * 525_600 / n_matches)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        store.insert_match(row)
+
+
+def _measure(action: Callable[[], Any]) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    result = action()
+    return result, (time.perf_counter() - started) * 1000.0
+
+
+def benchmark(store: LocalMatchStore, *, rtt_ms: float, bandwidth_mbps: float) -> str:
+    def wire_ms(payload_bytes: int, requests: int) -> float:
+        return requests * rtt_ms + payload_bytes * 8 / (bandwidth_mbps * 1000.0)
+
+    (rows, requests), download_ms = _measure(lambda: fetch_all(store))
+    full_bytes = len(json.dumps(rows, default=str))
+    cases = [
+        ("leaderboard", lambda: leaderboard_from_rows(rows), store.fetch_leaderboard),
+        ("mode", lambda: breakdown_from_rows(rows, "mode_id", "mode_name"), store.fetch_mode_summary),
+        ("map", lambda: breakdown_from_rows(rows, "map_id", "map_name"), store.fetch_map_summary),
+    ]
+
+    lines = [
+        f"{len(rows)} matches; network model: {rtt_ms:g} ms RTT per request, {bandwidth_mbps:g} Mbps",
+        f"{'Summary':<13}{'Path':<9}{'Rows':>8}{'Bytes':>12}{'Local ms':>10}{'Wire ms':>10}{'Total ms':>10}",
+    ]
+    for label, client_side, rpc in cases:
+        expected, aggregate_ms = _measure(client_side)
+        actual, rpc_ms = _measure(rpc)
+        if expected != actual:
+            lines.append(f"   Warning: {label} RPC result differs from client-side aggregation.")
+        rpc_bytes = len(json.dumps(actual, default=str))
+        scan_local = download_ms + aggregate_ms
+        scan_wire = wire_ms(full_bytes, requests)
+        rpc_wire = wire_ms(rpc_bytes, 1)
+        lines.append(
+            f"{label:<13}{'select=*':<9}{len(rows):>8}{full_bytes:>12}{scan_local:>10.1f}{scan_wire:>10.1f}"
+            f"{scan_local + scan_wire:>10.1f}"
+        )
+        lines.append(
+            f"{'':<13}{'rpc':<9}{len(actual):>8}{rpc_bytes:>12}{rpc_ms:>10.1f}{rpc_wire:>10.1f}"
+            f"{rpc_ms + rpc_wire:>10.1f}   ({full_bytes / max(rpc_bytes, 1):.0f}x smaller)"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--local", help="LocalMatchStore SQLite file")
+    source.add_argument("--synthetic", type=int, metavar="N", help="benchmark N random matches in memory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rtt-ms", type=float, default=40.0, help="modelled round trip per HTTP request")
+    parser.add_argument("--bandwidth-mbps", type=float, default=20.0, help="modelled download bandwidth")
+    args = parser.parse_args(argv)
+
+    if args.local:
+        store = LocalMatchStore.open(args.local)
+    else:
+        store = LocalMatchStore.open(":memory:")
+        seed_synthetic(store, args.synthetic, seed=args.seed)
+    print(benchmark(store, rtt_ms=args.rtt_ms, bandwidth_mbps=args.bandwidth_mbps))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Rating-balanced Guild vs JSOC team generation for /balance.
+
+Ratings are smoothed win rates from the leaderboard aggregate, and teams are
+compared by mean rating so an odd player count does not stack the smaller side
+with the best players. With up to eight players present everyone plays and the
+search scores every split at once over a NumPy combination array. With more players, two full teams of
+four are chosen and the rest sit out; that search sorts all four-player
+combinations by rating total and compares neighbours at growing distances,
+pruning every candidate whose gap already exceeds the best disjoint pair.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from discordbot_dev.match_flow import ROSTER_LOOKUP
+from discordbot_dev.roster import ROSTER
+
+
+# Mirrors PlayerSelect's max_values.
+MAX_TEAM_SIZE = 4
+
+
+@dataclass
+class BalancedSplit:
+    guild: List[int]
+    jsoc: List[int]
+    guild_rating: float  # mean player rating of the team
+    jsoc_rating: float
+    bench: List[int] = field(default_factory=list)
+
+    @property
+    def gap(self) -> float:
+        return abs(self.guild_rating - self.jsoc_rating)
+
+
+def resolve_players(text: str) -> Tuple[List[int], List[str]]:
+    """Map comma/space separated names or gamertags to roster ids; returns (ids, unknown)."""
+    by_key = {key.lower(): p.id for p in ROSTER for key in (p.name, p.gamertag)}
+    ids: List[int] = []
+    unknown: List[str] = []
+    for token in text.replace(",", " ").split():
+        player_id = by_key.get(token.lower())
+        if player_id is None:
+            unknown.append(token)
+        elif player_id not in ids:
+            ids.append(player_id)
+    return ids, unknown
+
+
+def ratings_from_leaderboard(rows: Sequence[Dict[str, Any]], prior_games: float = 2.0) -> Dict[str, float]:
+    """Win rate per player name shrunk toward 0.5 by ``prior_games`` imaginary games."""
+    return {
+        row["player_name"]: (row["wins"] + prior_games / 2.0) / (row["matches"] + prior_games)
+        for row in rows
+    }
+
+
+def _combination_array(n: int, k: int) -> np.ndarray:
+    flat = np.fromiter((i for combo in combinations(range(n), k) for i in combo), dtype=np.int64)
+    return flat.reshape(-1, k)
+
+
+def _split_everyone(ratings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Best split of all players into sizes n//2 and n - n//2 by mean rating."""
+    n = len(ratings)
+    k = n // 2
+    combos = _combination_array(n, k)
+    sums = ratings[combos].sum(axis=1)
+    gaps = np.abs(sums / k - (ratings.sum() - sums) / (n - k))
+    guild = combos[int(np.argmin(gaps))]
+    return guild, np.setdiff1d(np.arange(n), guild)
+
+
+def _split_with_bench(ratings: np.ndarray, team_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Best pair of disjoint ``team_size`` teams, searched in rating-sum order with pruning."""
+    combos = _combination_array(len(ratings), team_size)
+    sums = ratings[combos].sum(axis=1)
+    order = np.argsort(sums, kind="stable")
+    combos, sums = combos[order], sums[order]
+    masks = np.bitwise_or.reduce(np.left_shift(np.int64(1), combos), axis=1)
+
+    best_gap = np.inf
+    best: Optional[Tuple[int, int]] = None
+    active = np.arange(len(combos))
+    offset = 0
+    while active.size:
+        offset += 1
+        active = active[active + offset < len(combos)]
+        # For a fixed left index the gap only grows with the offset, so anything
+        # already at or above the best gap can never improve and is dropped.
+        gaps = sums[active + offset] - sums[active]
+        keep = gaps < best_gap
+        active, gaps = active[keep], gaps[keep]
+        if not active.size:
+            break
+        disjoint = (masks[active] & masks[active + offset]) == 0
+        if disjoint.any():
+            candidate = int(np.argmin(np.where(disjoint, gaps, np.inf)))
+            best_gap = gaps[candidate]
+            best = (int(active[candidate]), int(active[candidate]) + offset)
+    assert best is not None
+    return combos[best[0]], combos[best[1]]
+
+
+def balance_teams(
+    player_ids: Sequence[int],
+    ratings: Dict[str, float],
+    *,
+    default_rating: float = 0.5,
+    max_team_size: int = MAX_TEAM_SIZE,
+) -> BalancedSplit:
+    """Split the players present into the two teams with the smallest mean-rating gap."""
+    if len(player_ids) < 2:
+        raise ValueError("At least two players are needed to make teams.")
+    ids = np.asarray(player_ids, dtype=np.int64)
+    values = np.array([ratings.get(ROSTER_LOOKUP[p].name, default_rating) for p in player_ids], dtype=np.float64)
+
+    if len(ids) <= 2 * max_team_size:
+        guild, jsoc = _split_everyone(values)
+    else:
+        guild, jsoc = _split_with_bench(values, max_team_size)
+    bench = np.setdiff1d(np.arange(len(ids)), np.concatenate([guild, jsoc]))
+    return BalancedSplit(
+        guild=ids[guild].tolist(),
+        jsoc=ids[jsoc].tolist(),
+        guild_rating=float(values[guild].mean()),
+        jsoc_rating=float(values[jsoc].mean()),
+        bench=ids[bench].tolist(),
+    )
@@ -0,0 +1,306 @@
+"""Bootstrap confidence intervals and rank probabilities for power rankings.
+
+Raw win rates swing with every match when players have a handful of games.
+This job resamples the match history with replacement thousands of times,
+recomputes each player's (optionally smoothed) win rate per resample and
+reports percentile intervals plus the probability of landing at each rank.
+
+Resamples are split into fixed-size chunks, each seeded from one
+``SeedSequence``, so results are identical for any worker count.
+
+Usage:
+    python -m discordbot_dev.bootstrap_rankings --csv analytics_dev/data/sample_matches.csv --ranks
+    python -m discordbot_dev.bootstrap_rankings --synthetic 5000 --bench
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from discordbot_dev.match_flow import PLAYER_NAME_COLUMNS
+from discordbot_dev.roster import ROSTER
+
+
+# Resamples multiplied against the match matrices at once inside a worker.
+_INNER_BATCH = 64
+
+_worker_state: Dict[str, Any] = {}
+
+
+@dataclass
+class MatchMatrices:
+    players: List[str]
+    played: np.ndarray  # (matches, players) 1.0 where the player took part
+    won: np.ndarray  # (matches, players) 1.0 where the player's side won
+
+
+@dataclass
+class BootstrapResult:
+    players: List[str]
+    matches_played: np.ndarray
+    point_estimate: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    rank_probabilities: np.ndarray  # (players, ranks); rank 0 is first place
+    n_resamples: int
+    confidence: float
+
+    def table(self) -> List[Dict[str, Any]]:
+        """Rows ordered by point estimate, best first."""
+        order = np.argsort(-self.point_estimate, kind="stable")
+        return [
+            {
+                "player": self.players[i],
+                "matches": int(self.matches_played[i]),
+                "rating": float(self.point_estimate[i]),
+                "lower": float(self.lower[i]),
+                "upper": float(self.upper[i]),
+                "p_first": float(self.rank_probabilities[i, 0]),
+                "rank_probabilities": self.rank_probabilities[i].tolist(),
+            }
+            for i in order
+        ]
+
+    def format_table(self) -> str:
+        pct = int(round(self.confidence * 100))
+        lines = [f"{'Player':<16}{'Matches':>8}{'Rating':>9}{f'{pct}% CI':>18}{'P(#1)':>8}"]
+        for row in self.table():
+            interval = f"{row['lower']:.3f}-{row['upper']:.3f}"
+            lines.append(
+                f"{row['player']:<16}{row['matches']:>8}{row['rating']:>9.3f}{interval:>18}{row['p_first']:>8.1%}"
+            )
+        return "\n".join(lines)
+
+    def format_rank_table(self) -> str:
+        """Players x ranks table of P(finishing at rank), rows ordered by point estimate."""
+        ranks = self.rank_probabilities.shape[1]
+        lines = [f"{'Player':<16}" + "".join(f"{f'#{r + 1}':>7}" for r in range(ranks))]
+        for row in self.table():
+            lines.append(f"{row['player']:<16}" + "".join(f"{p:>7.1%}" for p in row["rank_probabilities"]))
+        return "\n".join(lines)
+
+
+def build_matrices(rows: Sequence[Dict[str, Any]]) -> MatchMatrices:
+    """Turn match_master rows into participation and win indicator matrices."""
+    players = sorted({row[c] for row in rows for c in PLAYER_NAME_COLUMNS if row.get(c)})
+    column_of = {name: i for i, name in enumerate(players)}
+    played = np.zeros((len(rows), len(players)), dtype=np.float64)
+    won = np.zeros_like(played)
+    for m, row in enumerate(rows):
+        guild_score, jsoc_score = row.get("guild_score"), row.get("jsoc_score")
+        for column in PLAYER_NAME_COLUMNS:
+            name = row.get(column)
+            if not name:
+                continue
+            played[m, column_of[name]] = 1.0
+            if guild_score is None or jsoc_score is None:
+                continue
+            if column.startswith("guild") and guild_score > jsoc_score:
+                won[m, column_of[name]] = 1.0
+            elif column.startswith("jsoc") and jsoc_score > guild_score:
+                won[m, column_of[name]] = 1.0
+    return MatchMatrices(players=players, played=played, won=won)
+
+
+def _ratings(wins: np.ndarray, played: np.ndarray, prior_games: float) -> np.ndarray:
+    """Win rate shrunk toward 0.5 by ``prior_games`` imaginary games (0 = raw rate)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (wins + prior_games / 2.0) / (played + prior_games)
+
+
+def _init_worker(played: np.ndarray, won: np.ndarray, prior_games: float) -> None:
+    _worker_state.update(played=played, won=won, prior_games=prior_games)
+
+
+def _run_chunk(task: Tuple[np.random.SeedSequence, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (ratings per resample, rank counts) for one chunk of resamples."""
+    seed, size = task
+    played, won, prior_games = _worker_state["played"], _worker_state["won"], _worker_state["prior_games"]
+    n_matches, n_players = played.shape
+    rng = np.random.default_rng(seed)
+    uniform = np.full(n_matches, 1.0 / n_matches)
+
+    ratings = np.empty((size, n_players))
+    rank_counts = np.zeros((n_players, n_players), dtype=np.int64)
+    player_axis = np.arange(n_players)
+    for start in range(0, size, _INNER_BATCH):
+        stop = min(start + _INNER_BATCH, size)
+        # Resampling with replacement == multinomial match weights per resample.
+        weights = rng.multinomial(n_matches, uniform, size=stop - start).astype(np.float64)
+        batch = _ratings(weights @ won, weights @ played, prior_games)
+        ratings[start:stop] = batch
+        # NaN (player absent from the resample) sorts last; ties are broken at random.
+        key = np.where(np.isnan(batch), np.inf, -batch)
+        order = np.lexsort((rng.random(key.shape), key), axis=1)
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, player_axis[None, :].repeat(len(order), axis=0), axis=1)
+        np.add.at(rank_counts, (np.broadcast_to(player_axis, ranks.shape), ranks), 1)
+    return ratings, rank_counts
+
+
+def bootstrap_rankings(
+    rows: Sequence[Dict[str, Any]],
+    *,
+    n_resamples: int = 5000,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    chunk_size: int = 250,
+    prior_games: float = 2.0,
+    confidence: float = 0.95,
+) -> BootstrapResult:
+    """Resample ``rows`` and summarise per-player rating uncertainty.
+
+    ``workers=None`` uses every core; ``workers=1`` runs in-process.
+    """
+    if not rows:
+        raise ValueError("At least one match is required to bootstrap rankings.")
+    matrices = build_matrices(rows)
+    sizes = [min(chunk_size, n_resamples - start) for start in range(0, n_resamples, chunk_size)]
+    tasks = list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+    initargs = (matrices.played, matrices.won, prior_games)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(*initargs)
+        outputs = [_run_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            outputs = list(pool.map(_run_chunk, tasks))
+
+    ratings = np.concatenate([chunk_ratings for chunk_ratings, _ in outputs])
+    rank_counts = sum(counts for _, counts in outputs)
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    lower, upper = np.nanpercentile(ratings, [tail, 100.0 - tail], axis=0)
+    matches_played = matrices.played.sum(axis=0)
+    return BootstrapResult(
+        players=matrices.players,
+        matches_played=matches_played,
+        point_estimate=_ratings(matrices.won.sum(axis=0), matches_played, prior_games),
+        lower=lower,
+        upper=upper,
+        rank_probabilities=rank_counts / float(n_resamples),
+        n_resamples=n_resamples,
+        confidence=confidence,
+    )
+
+
+def synthetic_matches(n_matches: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Random 4v4-or-smaller matches between roster players with hidden skill levels."""
+    rng = np.random.default_rng(seed)
+    names = [player.name for player in ROSTER] + [f"Guest{i}" for i in range(1, 7)]
+    skill = rng.normal(0.0, 1.0, len(names))
+    rows = []
+    for entry_id in range(1, n_matches + 1):
+        team_size = int(rng.integers(1, 5))
+        picks = rng.choice(len(names), size=team_size * 2, replace=False)
+        guild, jsoc = picks[:team_size], picks[team_size:]
+        guild_wins = rng.random() < 1.0 / (1.0 + np.exp(skill[jsoc].sum() - skill[guild].sum()))
+        row: Dict[str, Any] = {"entry_id": entry_id, "guild_score": 6 if guild_wins else 4, "jsoc_score": 4 if guild_wins else 6}
+        for prefix, team in (("guild", guild), ("jsoc", jsoc)):
+            for idx in range(4):
+                row[f"{prefix}_player{idx + 1}_name"] = names[team[idx]] if idx < len(team) else None
+        rows.append(row)
+    return rows
+
+
+def load_csv(path: str) -> List[Dict[str, Any]]:
+    """Read an export shaped like analytics_dev/data/sample_matches.csv."""
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = [dict(row) for row in csv.DictReader(handle)]
+    for row in rows:
+        for key in ("entry_id", "guild_score", "jsoc_score"):
+            row[key] = int(row[key]) if row.get(key) else None
+        for column in PLAYER_NAME_COLUMNS:
+            row[column] = row.get(column) or None
+    return rows
+
+
+def load_local(path: str) -> List[Dict[str, Any]]:
+    from discordbot_dev.local_store import LocalMatchStore
+
+    store = LocalMatchStore.open(path)
+    rows: List[Dict[str, Any]] = []
+    while True:
+        batch = store.fetch_matches_after(rows[-1]["entry_id"] if rows else 0, 1000)
+        if not batch:
+            return rows
+        rows.extend(batch)
+
+
+def benchmark(rows: Sequence[Dict[str, Any]], n_resamples: int, seed: int = 0) -> None:
+    """Time the job at 1, 2, 4, ... workers up to the core count and print the speedup."""
+    cores = os.cpu_count() or 1
+    counts = sorted({1 << i for i in range(cores.bit_length()) if 1 << i <= cores} | {cores})
+    print(f"{len(rows)} matches, {n_resamples} resamples, {cores} cores")
+    print(f"{'Workers':>8}{'Seconds':>10}{'Speedup':>10}{'Efficiency':>12}")
+    baseline = None
+    reference = None
+    for workers in counts:
+        started = time.perf_counter()
+        result = bootstrap_rankings(rows, n_resamples=n_resamples, seed=seed, workers=workers)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        if reference is None:
+            reference = result
+        elif not np.array_equal(reference.lower, result.lower, equal_nan=True):
+            print("   Warning: results differ from the single-worker run.")
+        speedup = baseline / elapsed
+        print(f"{workers:>8}{elapsed:>10.2f}{speedup:>9.2f}x{speedup / workers:>11.0%}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", help="CSV export of match_master")
+    source.add_argument("--local", help="LocalMatchStore SQLite file")
+    source.add_argument("--synthetic", type=int, metavar="N", help="generate N random matches")
+    parser.add_argument("--resamples", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("--prior-games", type=float, default=2.0, help="shrink toward 0.5; 0 for raw win rate")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--bench", action="store_true", help="time the job across worker counts")
+    parser.add_argument("--ranks", action="store_true", help="also print the full rank-probability table")
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        rows = load_csv(args.csv)
+    elif args.local:
+        rows = load_local(args.local)
+    else:
+        rows = synthetic_matches(args.synthetic, seed=args.seed)
+
+    if args.bench:
+        benchmark(rows, args.resamples, seed=args.seed)
+        return 0
+
+    result = bootstrap_rankings(
+        rows,
+        n_resamples=args.resamples,
+        seed=args.seed,
+        workers=args.workers,
+        prior_games=args.prior_games,
+        confidence=args.confidence,
+    )
+    print(result.format_table())
+    if args.ranks:
+        print()
+        print(result.format_rank_table())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""Watermarked change-feed consumers over match_master.
+
+A consumer polls its source (``SupabaseWriter`` or ``LocalMatchStore``) for rows
+with ``entry_id`` above its persisted watermark, hands each batch to every
+registered handler, and only then checkpoints the batch's highest entry_id.
+A crash or failing handler means the batch is delivered again on the next poll,
+so handlers must be idempotent (at-least-once delivery).
+
+Identity values are handed out before commit, so with several writers a lower
+entry_id can become visible after a higher one. Only gaps near the head of the
+table are held back: a gap is settled once the row after it is at least
+``settle_seconds`` old, judged by its ``match_timestamp`` or by this consumer
+having already seen that entry_id ``settle_seconds`` earlier. Old gaps (deleted
+rows, rolled-back inserts) therefore never slow a backfill, while a fresh gap
+holds delivery at its position until it fills or settles, so handlers see
+entry_ids in increasing order. A row that commits more than ``settle_seconds``
+after a later id is still missed, so keep the delay above the longest insert
+transaction; ``settle_seconds=0`` assumes a single writer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+Batch = List[Dict[str, Any]]
+Handler = Callable[[Batch], None]
+
+log = logging.getLogger(__name__)
+
+
+def _age_seconds(row: Dict[str, Any]) -> Optional[float]:
+    """Seconds since the row's match_timestamp, or None if it has none or cannot be parsed."""
+    value = row.get("match_timestamp")
+    if not value:
+        return None
+    try:
+        moment = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return time.time() - moment.timestamp()
+
+
+class WatermarkStore:
+    """JSON file mapping consumer names to their last checkpointed entry_id."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, int]:
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+    def load(self, consumer: str) -> int:
+        with self._lock:
+            return int(self._read().get(consumer, 0))
+
+    def save(self, consumer: str, entry_id: int) -> None:
+        """Persist a watermark atomically so a crash never leaves a torn file."""
+        with self._lock:
+            marks = self._read()
+            marks[consumer] = entry_id
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp_path.write_text(json.dumps(marks, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+
+class ChangeFeedConsumer:
+    def __init__(
+        self,
+        name: str,
+        source,
+        watermarks: WatermarkStore,
+        *,
+        batch_size: int = 500,
+        settle_seconds: float = 30.0,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.name = name
+        self.source = source
+        self.watermarks = watermarks
+        self.batch_size = batch_size
+        self.settle_seconds = settle_seconds
+        self.handlers: List[Tuple[str, Handler]] = []
+        # (monotonic time, highest entry_id fetched) per poll, until settle_seconds old.
+        self._heads: Deque[Tuple[float, int]] = deque()
+        # Highest entry_id that was already visible settle_seconds ago.
+        self._settled_head = 0
+
+    def register(self, handler: Handler, name: Optional[str] = None) -> Handler:
+        """Add a batch handler; returns it unchanged so this also works as a decorator."""
+        self.handlers.append((name or getattr(handler, "__name__", repr(handler)), handler))
+        return handler
+
+    @property
+    def watermark(self) -> int:
+        return self.watermarks.load(self.name)
+
+    def _gap_settled(self, row: Dict[str, Any]) -> bool:
+        """Whether a gap just below ``row`` can no longer fill, judged by how old ``row`` is."""
+        if row["entry_id"] <= self._settled_head:
+            return True
+        age = _age_seconds(row)
+        return age is not None and age >= self.settle_seconds
+
+    def _settled_prefix(self, watermark: int, batch: Batch) -> Batch:
+        """Rows of ``batch`` up to the first gap in entry_ids that is still settling."""
+        if batch:
+            now = time.monotonic()
+            self._heads.append((now, max(self._settled_head, batch[-1]["entry_id"])))
+            while self._heads and now - self._heads[0][0] >= self.settle_seconds:
+                self._settled_head = self._heads.popleft()[1]
+        expected = watermark + 1
+        ready: Batch = []
+        for row in batch:
+            if row["entry_id"] > expected:
+                if not self._gap_settled(row):
+                    break
+                log.info("Consumer %s skipping unfilled entry_ids %s-%s.", self.name, expected, row["entry_id"] - 1)
+            ready.append(row)
+            expected = row["entry_id"] + 1
+        return ready
+
+    def poll_once(self) -> int:
+        """Deliver one settled batch to every handler and checkpoint it; returns rows delivered."""
+        watermark = self.watermark
+        batch = self._settled_prefix(watermark, self.source.fetch_matches_after(watermark, self.batch_size))
+        if not batch:
+            return 0
+        for handler_name, handler in self.handlers:
+            try:
+                handler(batch)
+            except Exception:
+                log.exception(
+                    "Consumer %s handler %s failed; batch after entry_id %s will be redelivered.",
+                    self.name,
+                    handler_name,
+                    watermark,
+                )
+                raise
+        self.watermarks.save(self.name, max(row["entry_id"] for row in batch))
+        return len(batch)
+
+    def drain(self) -> int:
+        """Poll until caught up or held at a settling gap; returns the total rows delivered.
+
+        Settled gaps are delivered past within a batch, so a short batch only
+        means the head of the table (or a gap still settling) was reached.
+        """
+        total = 0
+        while True:
+            delivered = self.poll_once()
+            total += delivered
+            if delivered < self.batch_size:
+                return total
+
+    async def run(self, poll_seconds: float = 30.0, stop: Optional[asyncio.Event] = None) -> None:
+        """Drain on an interval off the event loop until ``stop`` is set."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                delivered = await asyncio.to_thread(self.drain)
+                if delivered:
+                    log.info("Consumer %s delivered %s rows (watermark %s).", self.name, delivered, self.watermark)
+            except Exception:
+                log.exception("Consumer %s poll failed; retrying in %ss.", self.name, poll_seconds)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=poll_seconds)
+            except asyncio.TimeoutError:
+                pass
@@ -16,6 +16,9 @@ class Settings:
     dry_run: bool = True
     guild_label: str = "Guild"
     jsoc_label: str = "JSOC"
+    history_page_size: int = 20
+    history_cache_pages: int = 256
+    history_index_ttl: float = 300.0
 
 
 def load_settings(env_path: Optional[str] = None) -> Settings:
@@ -28,6 +31,9 @@ def load_settings(env_path: Optional[str] = None) -> Settings:
     dry_run = os.environ.get("DRY_RUN", "true").lower() in {"1", "true", "yes"}
     guild_label = os.environ.get("GUILD_LABEL", "Guild")
     jsoc_label = os.environ.get("JSOC_LABEL", "JSOC")
+    history_page_size = int(os.environ.get("HISTORY_PAGE_SIZE", "20"))
+    history_cache_pages = int(os.environ.get("HISTORY_CACHE_PAGES", "256"))
+    history_index_ttl = float(os.environ.get("HISTORY_INDEX_TTL", "300"))
 
     if not discord_token:
         raise ValueError("DISCORD_TOKEN is required for the dev bot.")
@@ -42,5 +48,8 @@ def load_settings(env_path: Optional[str] = None) -> Settings:
         dry_run=dry_run,
         guild_label=guild_label,
         jsoc_label=jsoc_label,
+        history_page_size=history_page_size,
+        history_cache_pages=history_cache_pages,
+        history_index_ttl=history_index_ttl,
     )
 
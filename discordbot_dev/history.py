@@ -0,0 +1,257 @@
+"""Per-player match history backed by an entry_id index and an LRU page cache.
+
+Looking a player up in match_master means OR-ing eight ``*_playerN_name``
+columns, which scans the whole table. ``PlayerHistory`` pays that cost once per
+player to seed a short list of recent entry_ids, keeps it current from the
+writer's insert notifications, and caches rendered pages until a new match for
+that player invalidates them. Matches written by other processes show up once
+a player's index passes its TTL and is re-seeded, or immediately when
+``on_batch`` is registered as a change-feed handler.
+
+``on_batch`` may run on a worker thread (``ChangeFeedConsumer.run`` drains via
+``asyncio.to_thread``), so index and cache changes take a lock, and each player
+carries a generation counter that a page build checks before caching its text.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from discordbot_dev.match_flow import PLAYER_NAME_COLUMNS
+
+
+PageKey = Tuple[str, int]
+
+
+def players_in_row(row: Dict[str, Any]) -> Set[str]:
+    """Return the player names filling any of the eight roster slots of a row."""
+    return {row[column] for column in PLAYER_NAME_COLUMNS if row.get(column)}
+
+
+def team_of(row: Dict[str, Any], player_name: str) -> Optional[str]:
+    """Return ``"guild"`` or ``"jsoc"`` for the side the player was on."""
+    for column in PLAYER_NAME_COLUMNS:
+        if row.get(column) == player_name:
+            return column.split("_", 1)[0]
+    return None
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class PageCache:
+    """Bounded LRU of rendered history pages keyed by ``(player_name, page)``."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._pages: "OrderedDict[PageKey, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate size of the cached page strings."""
+        return self._bytes
+
+    def get(self, key: PageKey) -> Optional[str]:
+        with self._lock:
+            text = self._pages.get(key)
+            if text is None:
+                self.stats.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.stats.hits += 1
+            return text
+
+    def put(self, key: PageKey, text: str) -> None:
+        with self._lock:
+            if key in self._pages:
+                self._bytes -= sys.getsizeof(self._pages.pop(key))
+            self._pages[key] = text
+            self._bytes += sys.getsizeof(text)
+            while len(self._pages) > self.max_entries:
+                _, evicted = self._pages.popitem(last=False)
+                self._bytes -= sys.getsizeof(evicted)
+                self.stats.evictions += 1
+
+    def invalidate_player(self, player_name: str) -> int:
+        """Drop every cached page for a player and return how many were dropped."""
+        with self._lock:
+            stale = [key for key in self._pages if key[0] == player_name]
+            for key in stale:
+                self._bytes -= sys.getsizeof(self._pages.pop(key))
+            self.stats.invalidations += len(stale)
+            return len(stale)
+
+
+class PlayerHistory:
+    """Serve paged "recent matches" views for roster players."""
+
+    def __init__(
+        self,
+        writer,
+        *,
+        page_size: int = 20,
+        max_tracked: int = 100,
+        max_cached_pages: int = 256,
+        index_ttl_seconds: float = 300.0,
+        guild_label: str = "Guild",
+        jsoc_label: str = "JSOC",
+    ):
+        self.writer = writer
+        self.page_size = page_size
+        self.max_tracked = max_tracked
+        self.index_ttl_seconds = index_ttl_seconds
+        self.reseeds = 0
+        self.guild_label = guild_label
+        self.jsoc_label = jsoc_label
+        self.cache = PageCache(max_entries=max_cached_pages)
+        # Newest entry_id first; only players that have been looked up are indexed.
+        self._index: Dict[str, Deque[int]] = {}
+        self._seeded_at: Dict[str, float] = {}
+        # Bumped whenever a player's index or pages change; guards page builds racing on_batch.
+        self._generation: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _bump(self, player_name: str) -> None:
+        self._generation[player_name] = self._generation.get(player_name, 0) + 1
+        self.cache.invalidate_player(player_name)
+
+    def _expire_if_stale(self, player_name: str) -> None:
+        """Drop a player's index and pages once the TTL passes so the next read re-seeds."""
+        with self._lock:
+            seeded_at = self._seeded_at.get(player_name)
+            if seeded_at is None or time.monotonic() - seeded_at < self.index_ttl_seconds:
+                return
+            del self._index[player_name]
+            del self._seeded_at[player_name]
+            self._bump(player_name)
+            self.reseeds += 1
+
+    def recent_entry_ids(self, player_name: str) -> List[int]:
+        return self._snapshot(player_name)[0]
+
+    def _snapshot(self, player_name: str) -> Tuple[List[int], int]:
+        """Return the player's entry_ids (seeding them if needed) with their generation."""
+        self._expire_if_stale(player_name)
+        while True:
+            with self._lock:
+                entry_ids = self._index.get(player_name)
+                generation = self._generation.get(player_name, 0)
+                if entry_ids is not None:
+                    return list(entry_ids), generation
+            seeded = self.writer.fetch_player_entry_ids(player_name, limit=self.max_tracked)
+            with self._lock:
+                # A match applied during the fetch may be missing from it; seed again.
+                if self._generation.get(player_name, 0) == generation and player_name not in self._index:
+                    self._index[player_name] = deque(seeded, maxlen=self.max_tracked)
+                    self._seeded_at[player_name] = time.monotonic()
+
+    def page_count(self, player_name: str) -> int:
+        total = len(self.recent_entry_ids(player_name))
+        return max(1, -(-total // self.page_size))
+
+    def page(self, player_name: str, page: int = 1) -> str:
+        """Return the rendered page, building and caching it on a miss."""
+        self._expire_if_stale(player_name)
+        key = (player_name, page)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        entry_ids, generation = self._snapshot(player_name)
+        start = (page - 1) * self.page_size
+        page_ids = entry_ids[start:start + self.page_size]
+        rows = self.writer.fetch_matches_by_ids(page_ids) if page_ids else []
+        text = self._render(player_name, page, rows)
+        with self._lock:
+            # Only cache if no insert or re-seed touched the player while the page was built.
+            if self._generation.get(player_name, 0) == generation:
+                self.cache.put(key, text)
+        return text
+
+    def on_insert(self, row: Dict[str, Any]) -> None:
+        """Insert listener: refresh only the players who appear in the new match."""
+        entry_id = row.get("entry_id")
+        with self._lock:
+            for player_name in players_in_row(row):
+                self._bump(player_name)
+                entry_ids = self._index.get(player_name)
+                if entry_ids is None or entry_id is None or entry_id in entry_ids:
+                    continue
+                if not entry_ids or entry_id > entry_ids[0]:
+                    entry_ids.appendleft(entry_id)
+                else:
+                    # Rows from the change feed can arrive older than this process's own inserts.
+                    merged = sorted([*entry_ids, entry_id], reverse=True)
+                    self._index[player_name] = deque(merged[: self.max_tracked], maxlen=self.max_tracked)
+
+    def on_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """Change-feed handler: apply matches written by any process; safe to redeliver."""
+        for row in rows:
+            self.on_insert(row)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            index = list(self._index.values())
+        indexed = sum(len(entry_ids) for entry_ids in index)
+        return {
+            "hits": self.cache.stats.hits,
+            "misses": self.cache.stats.misses,
+            "hit_rate": self.cache.stats.hit_rate,
+            "evictions": self.cache.stats.evictions,
+            "invalidations": self.cache.stats.invalidations,
+            "reseeds": self.reseeds,
+            "cached_pages": len(self.cache),
+            "cache_bytes": self.cache.memory_bytes,
+            "indexed_players": len(index),
+            "indexed_entries": indexed,
+            "index_bytes": sum(sys.getsizeof(entry_ids) for entry_ids in index),
+        }
+
+    def _render(self, player_name: str, page: int, rows: List[Dict[str, Any]]) -> str:
+        total_pages = self.page_count(player_name)
+        header = f"**{player_name}** - recent matches (page {page}/{total_pages})"
+        if not rows:
+            return f"{header}\nNo matches recorded."
+
+        by_id = {row["entry_id"]: row for row in rows}
+        order = sorted(by_id, reverse=True)
+        lines = [header]
+        for entry_id in order:
+            lines.append(self._render_row(by_id[entry_id], player_name))
+        return "\n".join(lines)
+
+    def _render_row(self, row: Dict[str, Any], player_name: str) -> str:
+        guild_score = row.get("guild_score")
+        jsoc_score = row.get("jsoc_score")
+        team = team_of(row, player_name)
+        result = "-"
+        if team and guild_score is not None and jsoc_score is not None:
+            ours, theirs = (guild_score, jsoc_score) if team == "guild" else (jsoc_score, guild_score)
+            result = "W" if ours > theirs else "L" if ours < theirs else "D"
+        played_on = str(row.get("match_timestamp") or "")[:10] or "?"
+        return (
+            f"`#{row['entry_id']}` {played_on} | {row.get('mode_name') or '?'} on {row.get('map_name') or '?'} | "
+            f"{self.guild_label} {guild_score if guild_score is not None else '-'} - "
+            f"{jsoc_score if jsoc_score is not None else '-'} {self.jsoc_label} | {result}"
+        )
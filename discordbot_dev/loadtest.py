@@ -0,0 +1,343 @@
+"""Headless load test for the MatchLoggerView interaction flow.
+
+Drives N concurrent sessions through mode -> map -> players -> score modal ->
+submit using fake ``discord.Interaction`` objects against a ``LocalMatchStore``,
+then reports callback latency and event-loop lag. Memory per session comes from
+a second, untimed pass with tracemalloc on. Some sessions start from a /balance
+prefill, switch modes or edit their picks, and every select checks that the
+roster menus still show what ``MatchState`` holds.
+
+Usage:
+    python -m discordbot_dev.loadtest --sessions 50
+    python -m discordbot_dev.loadtest --sessions 40 --write-latency-ms 80 --max-p99-ms 250 --max-lag-p99-ms 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from discordbot_dev.balance import balance_teams
+from discordbot_dev.config import Settings
+from discordbot_dev.constants import MAPS, MODES
+from discordbot_dev.local_store import LocalMatchStore
+from discordbot_dev.match_flow import MatchState
+from discordbot_dev.roster import ROSTER
+from discordbot_dev.views import MatchLoggerView, OpenScoreModalButton, SubmitButton
+
+
+@dataclass
+class FakeUser:
+    id: int
+    display_name: str
+
+
+@dataclass
+class FakeResponse:
+    """Records what a callback sent instead of calling the Discord API."""
+
+    sent: List[Dict[str, Any]] = field(default_factory=list)
+    modal: Any = None
+
+    async def send_message(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        self.sent.append({"content": content, **kwargs})
+
+    async def edit_message(self, **kwargs: Any) -> None:
+        self.sent.append(kwargs)
+
+    async def send_modal(self, modal: Any) -> None:
+        self.modal = modal
+
+    def is_done(self) -> bool:
+        return bool(self.sent) or self.modal is not None
+
+
+@dataclass
+class FakeInteraction:
+    user: FakeUser
+    response: FakeResponse = field(default_factory=FakeResponse)
+
+
+class SlowWriter:
+    """Wrap a writer so every call blocks like a synchronous Supabase round-trip."""
+
+    def __init__(self, writer, latency_ms: float):
+        self._writer = writer
+        self._latency = latency_ms / 1000.0
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._writer, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            time.sleep(self._latency)
+            return attr(*args, **kwargs)
+
+        return call
+
+
+@dataclass
+class LoadReport:
+    sessions: int
+    completed: int
+    rows_written: int
+    wall_seconds: float
+    latencies_ms: Dict[str, List[float]]
+    loop_lag_ms: List[float]
+    bytes_per_session: float
+
+    def all_latencies(self) -> List[float]:
+        return [value for values in self.latencies_ms.values() for value in values]
+
+    def format(self) -> str:
+        lines = [
+            f"Sessions: {self.completed}/{self.sessions} completed, {self.rows_written} rows written "
+            f"in {self.wall_seconds:.2f}s",
+            f"{'Callback':<12}{'Count':>7}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+        ]
+        for step, values in list(self.latencies_ms.items()) + [("all", self.all_latencies())]:
+            lines.append(
+                f"{step:<12}{len(values):>7}{percentile(values, 50):>10.2f}"
+                f"{percentile(values, 99):>10.2f}{max(values, default=0.0):>10.2f}"
+            )
+        lines.append(
+            f"Event-loop lag: p50 {percentile(self.loop_lag_ms, 50):.2f} ms, "
+            f"p99 {percentile(self.loop_lag_ms, 99):.2f} ms, max {max(self.loop_lag_ms, default=0.0):.2f} ms"
+        )
+        lines.append(f"Memory per session: {self.bytes_per_session / 1024:.1f} KiB")
+        return "\n".join(lines)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+async def _monitor_loop_lag(samples: List[float], stop: asyncio.Event, interval: float = 0.01) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, (loop.time() - started - interval) * 1000.0))
+
+
+class SessionDriver:
+    """One simulated user clicking through a MatchLoggerView."""
+
+    def __init__(self, view: MatchLoggerView, user: FakeUser, rng: random.Random, think_seconds: float):
+        self.view = view
+        self.user = user
+        self.rng = rng
+        self.think_seconds = think_seconds
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.last_response: Optional[FakeResponse] = None
+
+    async def _dispatch(self, step: str, callback, *args: Any) -> FakeInteraction:
+        """Run interaction_check then the callback after a think-time pause.
+
+        Latency is measured from the moment the user clicks (the end of the
+        think time), so time spent queued behind other sessions' blocking
+        callbacks counts toward it, not just the callback's own run time.
+        """
+        think = self.rng.uniform(0, self.think_seconds) if self.think_seconds else 0.0
+        clicked_at = time.perf_counter() + think
+        if think:
+            await asyncio.sleep(think)
+        interaction = FakeInteraction(user=self.user)
+        if await self.view.interaction_check(interaction):
+            await callback(interaction, *args)
+        self.latencies[step].append((time.perf_counter() - clicked_at) * 1000.0)
+        self.last_response = interaction.response
+        return interaction
+
+    async def _select(self, step: str, select, values: List[str]) -> None:
+        # Mirrors Select._refresh_state, which discord.py runs before the callback.
+        select._values = values
+
+        async def run(interaction: FakeInteraction) -> None:
+            await select.callback(interaction)
+
+        await self._dispatch(step, run)
+        self._check_menus_in_sync()
+
+    def _check_menus_in_sync(self) -> None:
+        """Fail the session if a roster menu's defaults disagree with MatchState."""
+        state = self.view.state
+        menus = (
+            (self.view.guild_player_select, state.guild_players),
+            (self.view.jsoc_player_select, state.jsoc_players),
+            (self.view.ffa_player_select, state.ffa_players),
+        )
+        for select, picks in menus:
+            marked = sorted(int(option.value) for option in select.options if option.default)
+            if marked != sorted(picks):
+                raise AssertionError(f"'{select.placeholder}' shows {marked} but state has {sorted(picks)}")
+
+    def _button(self, kind: type):
+        return next(child for child in self.view.children if isinstance(child, kind))
+
+    async def run(self) -> bool:
+        self._check_menus_in_sync()
+        if self.rng.random() < 0.5:
+            # Change mind once: switching modes may reset (FFA <-> team) or keep picks.
+            await self._select("mode", self.view.mode_select, [self.rng.choice(MODES).code])
+        await self._select("mode", self.view.mode_select, [self.rng.choice(MODES).code])
+        await self._select("map", self.view.map_select, [self.rng.choice(MAPS).code])
+
+        ids = [str(player.id) for player in ROSTER]
+        self.rng.shuffle(ids)
+        state = self.view.state
+        if state.is_free_for_all():
+            await self._select("players", self.view.ffa_player_select, ids[: self.rng.randint(2, len(ids))])
+        else:
+            # Sessions prefilled by /balance usually keep the suggested teams.
+            if not (state.guild_players and state.jsoc_players) or self.rng.random() < 0.3:
+                if state.jsoc_players:
+                    # Clear JSOC first so new Guild picks don't collide with the old team.
+                    await self._select("players", self.view.jsoc_player_select, [])
+                team_size = self.rng.randint(1, min(4, len(ids) // 2))
+                await self._select("players", self.view.guild_player_select, ids[:team_size])
+                await self._select("players", self.view.jsoc_player_select, ids[team_size: team_size * 2])
+            if len(state.guild_players) > 1 and self.rng.random() < 0.5:
+                edited = [str(player_id) for player_id in state.guild_players[:-1]]
+                await self._select("players", self.view.guild_player_select, edited)
+
+        opened = await self._dispatch("open_modal", self._button(OpenScoreModalButton).callback)
+        modal = opened.response.modal
+        modal.by_who._value = self.user.display_name
+        modal.guild_score._value = str(self.rng.randint(0, 250))
+        modal.jsoc_score._value = str(self.rng.randint(0, 250))
+        await self._dispatch("scores", modal.on_submit)
+
+        await self._dispatch("submit", self._button(SubmitButton).callback)
+        sent = self.last_response.sent if self.last_response else []
+        return bool(sent) and str(sent[-1].get("content", "")).startswith("Match recorded")
+
+
+def _build_drivers(
+    sessions: int, writer, settings: Settings, think_seconds: float, seed: int
+) -> List[SessionDriver]:
+    drivers = []
+    for i in range(sessions):
+        user = FakeUser(id=10_000 + i, display_name=f"loadtest{i}")
+        rng = random.Random(seed + i)
+        state = MatchState(by_who=user.display_name)
+        if i % 3 == 0:
+            # Every third session starts from a /balance prefill.
+            present = rng.sample([player.id for player in ROSTER], rng.randint(2, len(ROSTER)))
+            split = balance_teams(present, {})
+            state.guild_players, state.jsoc_players = split.guild, split.jsoc
+        view = MatchLoggerView(owner_id=user.id, state=state, writer=writer, settings=settings)
+        drivers.append(SessionDriver(view, user, rng, think_seconds))
+    return drivers
+
+
+async def _memory_per_session(sessions: int, settings: Settings, seed: int) -> float:
+    """Untimed pass with tracemalloc on; returns bytes retained per session.
+
+    Kept separate from the timed run because tracing slows every allocation and
+    would inflate the latency and loop-lag numbers the gates are judged on.
+    """
+    store = LocalMatchStore.open(":memory:")
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        drivers = _build_drivers(sessions, store, settings, 0.0, seed)
+        await asyncio.gather(*(driver.run() for driver in drivers), return_exceptions=True)
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    for driver in drivers:
+        driver.view.stop()
+    return retained / max(sessions, 1)
+
+
+async def run_load_test(
+    sessions: int,
+    *,
+    write_latency_ms: float = 0.0,
+    think_seconds: float = 0.05,
+    seed: int = 0,
+) -> LoadReport:
+    store = LocalMatchStore.open(":memory:")
+    writer = SlowWriter(store, write_latency_ms) if write_latency_ms else store
+    settings = Settings(discord_token="loadtest", supabase_url="", supabase_key="", dry_run=False)
+    drivers = _build_drivers(sessions, writer, settings, think_seconds, seed)
+
+    lag_samples: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_monitor_loop_lag(lag_samples, stop))
+    started = time.perf_counter()
+    results = await asyncio.gather(*(driver.run() for driver in drivers), return_exceptions=True)
+    wall_seconds = time.perf_counter() - started
+    stop.set()
+    await monitor
+    for driver in drivers:
+        driver.view.stop()
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    for driver in drivers:
+        for step, values in driver.latencies.items():
+            latencies[step].extend(values)
+    for result in results:
+        if isinstance(result, BaseException):
+            print(f"Session failed: {result!r}", file=sys.stderr)
+
+    return LoadReport(
+        sessions=sessions,
+        completed=sum(result is True for result in results),
+        rows_written=len(store.fetch_matches_after(0, sessions + 1)),
+        wall_seconds=wall_seconds,
+        latencies_ms=dict(latencies),
+        loop_lag_ms=lag_samples,
+        bytes_per_session=await _memory_per_session(sessions, settings, seed),
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--write-latency-ms", type=float, default=0.0, help="blocking delay per writer call")
+    parser.add_argument("--think-seconds", type=float, default=0.05, help="max random pause between clicks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-p99-ms", type=float, default=None, help="exit 1 if callback p99 exceeds this")
+    parser.add_argument("--max-lag-p99-ms", type=float, default=None, help="exit 1 if event-loop lag p99 exceeds this")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(
+        run_load_test(
+            args.sessions,
+            write_latency_ms=args.write_latency_ms,
+            think_seconds=args.think_seconds,
+            seed=args.seed,
+        )
+    )
+    print(report.format())
+    if report.completed != report.sessions:
+        print("❌ Some sessions did not record a match.")
+        return 1
+    if args.max_p99_ms is not None and percentile(report.all_latencies(), 99) > args.max_p99_ms:
+        print(f"❌ Callback p99 exceeds {args.max_p99_ms} ms.")
+        return 1
+    if args.max_lag_p99_ms is not None and percentile(report.loop_lag_ms, 99) > args.max_lag_p99_ms:
+        print(f"❌ Event-loop lag p99 exceeds {args.max_lag_p99_ms} ms.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""SQLite stand-in for the Supabase match_master schema.
+
+``LocalMatchStore`` exposes the same methods as ``SupabaseWriter`` so tools,
+consumers and load tests can run without network access or credentials.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from discordbot_dev.constants import MAPS, MODES
+from discordbot_dev.match_flow import PLAYER_NAME_COLUMNS, TEAM_PREFIXES
+from discordbot_dev.supabase_client import InsertListener, notify_insert_listeners
+
+
+PLAYER_STAT_FIELDS: List[str] = ["level", "name", "obj_score", "time", "obj_kills", "captures"]
+
+MATCH_COLUMNS: List[str] = [
+    "by_who",
+    "match_timestamp",
+    "map_id",
+    "mode_id",
+    "guild_score",
+    "jsoc_score",
+] + [
+    f"{prefix}_player{idx}_{stat}"
+    for prefix in TEAM_PREFIXES
+    for idx in range(1, 5)
+    for stat in PLAYER_STAT_FIELDS
+]
+
+
+def _column_type(column: str) -> str:
+    return "TEXT" if column in PLAYER_NAME_COLUMNS or column in {"by_who", "match_timestamp"} else "INTEGER"
+
+
+def _schema(table_name: str) -> str:
+    columns = ",\n    ".join(
+        f"{column} {_column_type(column)}"
+        + (" DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))" if column == "match_timestamp" else "")
+        + (" REFERENCES maps (map_id)" if column == "map_id" else "")
+        + (" REFERENCES modes (mode_id)" if column == "mode_id" else "")
+        for column in MATCH_COLUMNS
+    )
+    return f"""
+CREATE TABLE IF NOT EXISTS maps (
+    map_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    map_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS modes (
+    mode_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mode_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS {table_name} (
+    entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    {columns}
+);
+CREATE INDEX IF NOT EXISTS idx_{table_name}_match_timestamp ON {table_name} (match_timestamp);
+CREATE INDEX IF NOT EXISTS idx_{table_name}_map_id ON {table_name} (map_id);
+CREATE INDEX IF NOT EXISTS idx_{table_name}_mode_id ON {table_name} (mode_id);
+"""
+
+
+# SQLite translations of the RPCs in db/aggregates_dev.sql; timestamps compare as ISO-8601 text.
+_TIME_FILTER = "(:since IS NULL OR match_timestamp >= :since) AND (:until IS NULL OR match_timestamp < :until)"
+
+
+def _leaderboard_sql(table_name: str) -> str:
+    slots = "\n    UNION ALL\n    ".join(
+        f"SELECT {column} AS player_name, "
+        + ("guild_score > jsoc_score" if column.startswith("guild") else "jsoc_score > guild_score")
+        + f" AS won FROM {table_name} WHERE {_TIME_FILTER}"
+        for column in PLAYER_NAME_COLUMNS
+    )
+    return f"""
+WITH slots AS (
+    {slots}
+)
+SELECT
+    player_name,
+    COUNT(*) AS matches,
+    SUM(COALESCE(won, 0)) AS wins,
+    COUNT(*) - SUM(COALESCE(won, 0)) AS losses,
+    ROUND(CAST(SUM(COALESCE(won, 0)) AS REAL) / COUNT(*), 4) AS win_rate
+FROM slots
+WHERE player_name IS NOT NULL
+GROUP BY player_name
+ORDER BY wins DESC, matches DESC, player_name
+"""
+
+
+def _breakdown_sql(table_name: str, lookup: str, key: str, name: str) -> str:
+    return f"""
+SELECT
+    m.{key},
+    {lookup}.{name},
+    COUNT(*) AS matches,
+    ROUND(AVG(m.guild_score), 2) AS avg_guild,
+    ROUND(AVG(m.jsoc_score), 2) AS avg_jsoc,
+    SUM(CASE WHEN m.guild_score > m.jsoc_score THEN 1 ELSE 0 END) AS guild_wins,
+    SUM(CASE WHEN m.jsoc_score > m.guild_score THEN 1 ELSE 0 END) AS jsoc_wins
+FROM {table_name} AS m
+LEFT JOIN {lookup} ON {lookup}.{key} = m.{key}
+WHERE {_TIME_FILTER}
+GROUP BY m.{key}, {lookup}.{name}
+ORDER BY matches DESC, m.{key}
+"""
+
+
+@dataclass
+class LocalMatchStore:
+    connection: sqlite3.Connection
+    table_name: str = "match_master"
+    insert_listeners: List[InsertListener] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def open(cls, path: str = ":memory:", table_name: str = "match_master") -> "LocalMatchStore":
+        """Open (or create) a local database seeded with the MAPS and MODES lookups."""
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        store = cls(connection=connection, table_name=table_name)
+        with store._lock, connection:
+            connection.executescript(_schema(table_name))
+            if connection.execute("SELECT COUNT(*) FROM maps").fetchone()[0] == 0:
+                connection.executemany("INSERT INTO maps (map_name) VALUES (?)", [(m.label,) for m in MAPS])
+            if connection.execute("SELECT COUNT(*) FROM modes").fetchone()[0] == 0:
+                connection.executemany("INSERT INTO modes (mode_name) VALUES (?)", [(m.label,) for m in MODES])
+        return store
+
+    def _query(self, sql: str, params: tuple | Dict[str, Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self.connection.execute(sql, params).fetchall()]
+
+    def lookup_map_id(self, map_label: str) -> Optional[int]:
+        rows = self._query("SELECT map_id FROM maps WHERE map_name = ? LIMIT 1", (map_label,))
+        return rows[0]["map_id"] if rows else None
+
+    def lookup_mode_id(self, mode_label: str) -> Optional[int]:
+        rows = self._query("SELECT mode_id FROM modes WHERE mode_name = ? LIMIT 1", (mode_label,))
+        return rows[0]["mode_id"] if rows else None
+
+    def add_insert_listener(self, listener: InsertListener) -> None:
+        self.insert_listeners.append(listener)
+
+    def insert_match(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a match row; keys outside the match_master schema are ignored."""
+        columns = [column for column in MATCH_COLUMNS if payload.get(column) is not None]
+        placeholders = ", ".join("?" for _ in columns)
+        sql = (
+            f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({placeholders}) RETURNING *"
+            if columns
+            else f"INSERT INTO {self.table_name} DEFAULT VALUES RETURNING *"
+        )
+        with self._lock, self.connection:
+            row = dict(self.connection.execute(sql, tuple(payload[c] for c in columns)).fetchone())
+        notify_insert_listeners(self.insert_listeners, row)
+        return {"data": [row], "dry_run": False}
+
+    def _select_with_lookups(self, where: str, params: tuple) -> List[Dict[str, Any]]:
+        return self._query(
+            f"SELECT m.*, maps.map_name, modes.mode_name FROM {self.table_name} AS m "
+            "LEFT JOIN maps ON maps.map_id = m.map_id "
+            "LEFT JOIN modes ON modes.mode_id = m.mode_id "
+            f"WHERE {where}",
+            params,
+        )
+
+    def fetch_player_entry_ids(self, player_name: str, limit: int) -> List[int]:
+        slots = " OR ".join(f"{column} = ?" for column in PLAYER_NAME_COLUMNS)
+        rows = self._query(
+            f"SELECT entry_id FROM {self.table_name} WHERE {slots} ORDER BY entry_id DESC LIMIT ?",
+            tuple([player_name] * len(PLAYER_NAME_COLUMNS)) + (limit,),
+        )
+        return [row["entry_id"] for row in rows]
+
+    def fetch_matches_by_ids(self, entry_ids: List[int]) -> List[Dict[str, Any]]:
+        if not entry_ids:
+            return []
+        placeholders = ", ".join("?" for _ in entry_ids)
+        return self._select_with_lookups(f"m.entry_id IN ({placeholders})", tuple(entry_ids))
+
+    def fetch_matches_after(self, entry_id: int, limit: int) -> List[Dict[str, Any]]:
+        return self._select_with_lookups("m.entry_id > ? ORDER BY m.entry_id LIMIT ?", (entry_id, limit))
+
+    def fetch_leaderboard(self, since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._query(_leaderboard_sql(self.table_name), {"since": since, "until": until})
+
+    def fetch_mode_summary(self, since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        sql = _breakdown_sql(self.table_name, "modes", "mode_id", "mode_name")
+        return self._query(sql, {"since": since, "until": until})
+
+    def fetch_map_summary(self, since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        sql = _breakdown_sql(self.table_name, "maps", "map_id", "map_name")
+        return self._query(sql, {"since": since, "until": until})
@@ -8,19 +8,26 @@ import sys
 from pathlib import Path
 
 import discord
+from discord import app_commands
 from discord.ext import commands
 
 # Handle both direct execution and module execution
 if __name__ == "__main__" and __package__ is None:
     # Add parent directory to path when running directly
     sys.path.insert(0, str(Path(__file__).parent.parent))
+    from discordbot_dev.balance import balance_teams, ratings_from_leaderboard, resolve_players
     from discordbot_dev.config import Settings, load_settings
-    from discordbot_dev.match_flow import MatchState
+    from discordbot_dev.history import PlayerHistory
+    from discordbot_dev.match_flow import ROSTER_LOOKUP, MatchState
+    from discordbot_dev.roster import ROSTER
     from discordbot_dev.supabase_client import SupabaseWriter
     from discordbot_dev.views import MatchLoggerView
 else:
+    from discordbot_dev.balance import balance_teams, ratings_from_leaderboard, resolve_players
     from discordbot_dev.config import Settings, load_settings
-    from discordbot_dev.match_flow import MatchState
+    from discordbot_dev.history import PlayerHistory
+    from discordbot_dev.match_flow import ROSTER_LOOKUP, MatchState
+    from discordbot_dev.roster import ROSTER
     from discordbot_dev.supabase_client import SupabaseWriter
     from discordbot_dev.views import MatchLoggerView
 
@@ -35,6 +42,15 @@ class MatchLoggerBot(commands.Bot):
         super().__init__(command_prefix="!", intents=intents)
         self.settings = settings
         self.writer = SupabaseWriter.from_settings(settings)
+        self.history = PlayerHistory(
+            self.writer,
+            page_size=settings.history_page_size,
+            max_cached_pages=settings.history_cache_pages,
+            index_ttl_seconds=settings.history_index_ttl,
+            guild_label=settings.guild_label,
+            jsoc_label=settings.jsoc_label,
+        )
+        self.writer.add_insert_listener(self.history.on_insert)
 
     async def setup_hook(self) -> None:
         await self.tree.sync()
@@ -63,6 +79,69 @@ async def logmatch(interaction: discord.Interaction) -> None:
     )
 
 
+@bot.tree.command(name="history", description="Show a player's most recent matches.")
+@app_commands.describe(player="Roster player to look up", page="Page number, newest matches first")
+@app_commands.choices(player=[app_commands.Choice(name=p.name, value=p.name) for p in ROSTER])
+async def history(
+    interaction: discord.Interaction,
+    player: str,
+    page: app_commands.Range[int, 1, None] = 1,
+) -> None:
+    text = bot.history.page(player, page)
+    await interaction.response.send_message(text, ephemeral=True)
+
+
+@bot.tree.command(name="historystats", description="Show /history cache hit rate and memory use.")
+async def historystats(interaction: discord.Interaction) -> None:
+    stats = bot.history.stats()
+    await interaction.response.send_message(
+        f"Hits: {stats['hits']} | Misses: {stats['misses']} | Hit rate: {stats['hit_rate']:.1%}\n"
+        f"Cached pages: {stats['cached_pages']} ({stats['cache_bytes']} bytes) | "
+        f"Evictions: {stats['evictions']} | Invalidations: {stats['invalidations']} | "
+        f"Re-seeds: {stats['reseeds']}\n"
+        f"Indexed: {stats['indexed_players']} players, {stats['indexed_entries']} matches "
+        f"({stats['index_bytes']} bytes)",
+        ephemeral=True,
+    )
+
+
+@bot.tree.command(name="balance", description="Split the players present into rating-balanced teams.")
+@app_commands.describe(players="Names or gamertags of everyone present, separated by commas or spaces")
+async def balance(interaction: discord.Interaction, players: str) -> None:
+    player_ids, unknown = resolve_players(players)
+    if unknown:
+        await interaction.response.send_message(f"Unknown players: {', '.join(unknown)}", ephemeral=True)
+        return
+    if len(player_ids) < 2:
+        await interaction.response.send_message("Name at least two players to balance.", ephemeral=True)
+        return
+    try:
+        ratings = ratings_from_leaderboard(bot.writer.fetch_leaderboard())
+    except Exception:
+        logging.warning("Leaderboard unavailable; balancing with neutral ratings.")
+        ratings = {}
+
+    split = balance_teams(player_ids, ratings)
+    state = MatchState(
+        by_who=interaction.user.display_name,
+        guild_players=split.guild,
+        jsoc_players=split.jsoc,
+    )
+    view = MatchLoggerView(owner_id=interaction.user.id, state=state, writer=bot.writer, settings=bot.settings)
+    summary = (
+        f"Balanced teams (average rating): {bot.settings.guild_label} {split.guild_rating:.2f} vs "
+        f"{bot.settings.jsoc_label} {split.jsoc_rating:.2f} (gap {split.gap:.2f})"
+    )
+    if split.bench:
+        summary += f"\nSitting out: {', '.join(ROSTER_LOOKUP[p].name for p in split.bench)}"
+    await interaction.response.send_message(
+        content=summary,
+        embed=view.build_embed(),
+        view=view,
+        ephemeral=True,
+    )
+
+
 def main() -> None:
     asyncio.run(bot.start(bot.settings.discord_token))
 
@@ -10,6 +10,13 @@ from discordbot_dev.roster import Player, ROSTER
 
 ROSTER_LOOKUP: Dict[int, Player] = {player.id: player for player in ROSTER}
 
+TEAM_PREFIXES: List[str] = ["guild", "jsoc"]
+
+# The eight roster slots of the denormalized match_master row, in column order.
+PLAYER_NAME_COLUMNS: List[str] = [
+    f"{prefix}_player{idx}_name" for prefix in TEAM_PREFIXES for idx in range(1, 5)
+]
+
 
 @dataclass
 class MatchState:
@@ -0,0 +1,223 @@
+"""Compact append-only binary match log with memory-mapped reads.
+
+Each match is a fixed 30-byte little-endian record: entry_id, a unix timestamp,
+map and mode as 1-based positions in ``MAPS``/``MODES``, both scores, and four
+roster slots per team holding ``Player.id`` (0 = empty, 255 = not on ROSTER).
+Readers map the file as a NumPy structured array, so scans over millions of
+matches never parse text or touch the network.
+
+Usage:
+    python -m discordbot_dev.match_log --local dev.db --log matches.bo7
+    python -m discordbot_dev.match_log --csv analytics_dev/data/sample_matches.csv --log matches.bo7
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import struct
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from discordbot_dev.constants import MAPS, MODES
+from discordbot_dev.match_flow import ROSTER_LOOKUP, TEAM_PREFIXES
+from discordbot_dev.roster import ROSTER
+
+
+MAGIC = b"BO7L"
+VERSION = 2
+EMPTY_SLOT = 0
+GUEST_ID = 255
+# match_master scores are INT; the one value outside the column's range marks a missing score.
+NO_SCORE = -(2**31)
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("entry_id", "<u4"),
+        ("timestamp", "<i8"),
+        ("map_id", "u1"),
+        ("mode_id", "u1"),
+        ("guild_score", "<i4"),
+        ("jsoc_score", "<i4"),
+        ("guild", "u1", (4,)),
+        ("jsoc", "u1", (4,)),
+    ]
+)
+
+# magic, version, record size, reserved
+_HEADER = struct.Struct("<4sHH8x")
+HEADER_SIZE = _HEADER.size
+
+PLAYER_IDS: Dict[str, int] = {player.name: player.id for player in ROSTER}
+MAP_IDS: Dict[str, int] = {key: i for i, m in enumerate(MAPS, 1) for key in (m.code, m.label)}
+MODE_IDS: Dict[str, int] = {key: i for i, m in enumerate(MODES, 1) for key in (m.code, m.label)}
+
+
+class MatchLogError(ValueError):
+    """Raised when a file is not a match log this version can read."""
+
+
+def _check_header(raw: bytes, path: Path) -> None:
+    if len(raw) != HEADER_SIZE:
+        raise MatchLogError(f"{path} is too short to hold a match log header ({len(raw)} bytes).")
+    magic, version, record_size = _HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise MatchLogError(f"{path} is not a BO7 match log.")
+    if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise MatchLogError(f"{path} uses log version {version} ({record_size}-byte records); expected {VERSION}.")
+
+
+def _timestamp(value: Any) -> int:
+    if not value:
+        return 0
+    if isinstance(value, datetime):
+        moment = value
+    else:
+        moment = datetime.fromisoformat(str(value))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def encode_rows(rows: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """Encode match_master rows (feed rows or CSV exports) as log records."""
+    records = np.zeros(len(rows), dtype=RECORD_DTYPE)
+    for i, row in enumerate(rows):
+        record = records[i]
+        record["entry_id"] = row["entry_id"]
+        record["timestamp"] = _timestamp(row.get("match_timestamp"))
+        record["map_id"] = MAP_IDS.get(row.get("map_name") or row.get("map") or "", 0)
+        record["mode_id"] = MODE_IDS.get(row.get("mode_name") or row.get("mode") or "", 0)
+        for team in TEAM_PREFIXES:
+            score = row.get(f"{team}_score")
+            if score is not None and not NO_SCORE < int(score) < 2**31:
+                raise MatchLogError(f"entry_id {row['entry_id']} has a {team}_score of {score}, outside the log's range.")
+            record[f"{team}_score"] = NO_SCORE if score is None else score
+            for idx in range(4):
+                name = row.get(f"{team}_player{idx + 1}_name")
+                record[team][idx] = PLAYER_IDS.get(name, GUEST_ID) if name else EMPTY_SLOT
+    return records
+
+
+class MatchLogWriter:
+    """Single appender for a log file; ``append`` doubles as a change-feed handler."""
+
+    def __init__(self, path: str | Path, *, fsync: bool = False):
+        self.path = Path(path)
+        self.fsync = fsync
+        self.last_entry_id = 0
+        header = _HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize)
+        if not self.path.exists() or self.path.stat().st_size < HEADER_SIZE:
+            # New file, or a header torn by a crash before any record was written;
+            # anything else that short is not ours to overwrite.
+            if self.path.exists() and not header.startswith(self.path.read_bytes()):
+                raise MatchLogError(f"{self.path} is not a BO7 match log; refusing to overwrite it.")
+            with self.path.open("wb") as handle:
+                handle.write(header)
+            return
+        with self.path.open("r+b") as handle:
+            _check_header(handle.read(HEADER_SIZE), self.path)
+            body = self.path.stat().st_size - HEADER_SIZE
+            complete = body - body % RECORD_DTYPE.itemsize
+            if complete != body:
+                # Drop a torn tail left by a crash mid-append.
+                handle.truncate(HEADER_SIZE + complete)
+            if complete:
+                handle.seek(HEADER_SIZE + complete - RECORD_DTYPE.itemsize)
+                last = np.frombuffer(handle.read(RECORD_DTYPE.itemsize), dtype=RECORD_DTYPE)
+                self.last_entry_id = int(last["entry_id"][0])
+
+    def append(self, rows: Sequence[Dict[str, Any]]) -> int:
+        """Append rows newer than the log's tail in entry_id order; returns rows written.
+
+        Rows at or below the last logged entry_id are skipped, which makes
+        redelivered change-feed batches harmless.
+        """
+        fresh = sorted((row for row in rows if row["entry_id"] > self.last_entry_id), key=lambda row: row["entry_id"])
+        if not fresh:
+            return 0
+        records = encode_rows(fresh)
+        with self.path.open("ab") as handle:
+            handle.write(records.tobytes())
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+        self.last_entry_id = int(records["entry_id"][-1])
+        return len(records)
+
+
+def read_log(path: str | Path) -> np.ndarray:
+    """Memory-map a log read-only as a structured array (no copy, no parsing)."""
+    path = Path(path)
+    with path.open("rb") as handle:
+        _check_header(handle.read(HEADER_SIZE), path)
+    count = (path.stat().st_size - HEADER_SIZE) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+
+
+def player_records(log: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (played, wins) arrays indexed by player id, computed with vectorized scans."""
+    scored = (log["guild_score"] != NO_SCORE) & (log["jsoc_score"] != NO_SCORE)
+    guild_won = scored & (log["guild_score"] > log["jsoc_score"])
+    jsoc_won = scored & (log["jsoc_score"] > log["guild_score"])
+    slots = np.concatenate([log["guild"], log["jsoc"]], axis=1)
+    winners = np.concatenate([log["guild"][guild_won], log["jsoc"][jsoc_won]], axis=0)
+    played = np.bincount(slots.ravel(), minlength=256)
+    wins = np.bincount(winners.ravel(), minlength=256)
+    played[EMPTY_SLOT] = wins[EMPTY_SLOT] = 0
+    return played, wins
+
+
+def format_summary(log: np.ndarray) -> str:
+    played, wins = player_records(log)
+    lines = [f"{len(log)} matches", f"{'Player':<12}{'Played':>8}{'Wins':>8}{'Win %':>8}"]
+    for player_id in np.flatnonzero(played):
+        name = ROSTER_LOOKUP[player_id].name if player_id in ROSTER_LOOKUP else "Guests"
+        lines.append(f"{name:<12}{played[player_id]:>8}{wins[player_id]:>8}{wins[player_id] / played[player_id]:>8.1%}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--local", help="LocalMatchStore SQLite file to sync from via the change feed")
+    source.add_argument("--csv", help="CSV export of match_master to import")
+    parser.add_argument("--log", required=True, help="binary log file to append to and summarise")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    writer = MatchLogWriter(args.log)
+    if args.local:
+        from discordbot_dev.change_feed import ChangeFeedConsumer, WatermarkStore
+        from discordbot_dev.local_store import LocalMatchStore
+
+        consumer = ChangeFeedConsumer(
+            "match_log",
+            LocalMatchStore.open(args.local),
+            WatermarkStore(f"{args.log}.watermark.json"),
+            batch_size=args.batch_size,
+            # A local SQLite file has a single writer, so entry_id gaps never fill later.
+            settle_seconds=0,
+        )
+        consumer.register(writer.append, name="match_log")
+        consumer.drain()
+    elif args.csv:
+        from discordbot_dev.bootstrap_rankings import load_csv
+
+        writer.append(load_csv(args.csv))
+
+    print(format_summary(read_log(args.log)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
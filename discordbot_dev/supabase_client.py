@@ -2,18 +2,52 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
 
 from supabase import Client, create_client
 
 from discordbot_dev.config import Settings
+from discordbot_dev.match_flow import PLAYER_NAME_COLUMNS
+
+
+InsertListener = Callable[[Dict[str, Any]], None]
+
+log = logging.getLogger(__name__)
+
+# Columns needed to render a match summary; map/mode names come from the FK embeds.
+SUMMARY_COLUMNS = ", ".join(
+    ["entry_id", "match_timestamp", "guild_score", "jsoc_score", "maps(map_name)", "modes(mode_name)"]
+    + PLAYER_NAME_COLUMNS
+)
+
+
+def _flatten_lookups(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace embedded ``maps``/``modes`` objects with flat ``map_name``/``mode_name`` keys."""
+    row["map_name"] = (row.pop("maps", None) or {}).get("map_name")
+    row["mode_name"] = (row.pop("modes", None) or {}).get("mode_name")
+    return row
+
+
+def notify_insert_listeners(listeners: List[InsertListener], row: Dict[str, Any]) -> None:
+    """Call each listener with a committed row; a failing listener is logged, never raised.
+
+    The insert has already succeeded at this point, so surfacing a listener bug
+    to the caller would invite a duplicate resubmit of a recorded match.
+    """
+    for listener in listeners:
+        try:
+            listener(row)
+        except Exception:
+            log.exception("Insert listener %r failed for entry_id %s.", listener, row.get("entry_id"))
 
 
 @dataclass
 class SupabaseWriter:
     settings: Settings
     client: Client
+    insert_listeners: List[InsertListener] = field(default_factory=list)
 
     @classmethod
     def from_settings(cls, settings: Settings) -> "SupabaseWriter":
@@ -52,14 +86,71 @@ class SupabaseWriter:
             pass
         return None
 
+    def add_insert_listener(self, listener: InsertListener) -> None:
+        """Register a callback invoked with each row returned by insert_match."""
+        self.insert_listeners.append(listener)
+
     def insert_match(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Insert a match row or echo the payload when dry-run is enabled."""
         if self.settings.dry_run:
-            return {"data": [payload], "dry_run": True}
-        return (
+            result = {"data": [payload], "dry_run": True}
+        else:
+            result = (
+                self.client.table(self.settings.table_name)
+                .insert(payload)
+                .execute()
+                .model_dump()
+            )
+        for row in result.get("data") or []:
+            notify_insert_listeners(self.insert_listeners, row)
+        return result
+
+    def fetch_player_entry_ids(self, player_name: str, limit: int) -> List[int]:
+        """Return the player's most recent entry_ids, newest first."""
+        slots = ",".join(f'{column}.eq."{player_name}"' for column in PLAYER_NAME_COLUMNS)
+        result = (
             self.client.table(self.settings.table_name)
-            .insert(payload)
+            .select("entry_id")
+            .or_(slots)
+            .order("entry_id", desc=True)
+            .limit(limit)
             .execute()
-            .model_dump()
         )
+        return [row["entry_id"] for row in result.data]
+
+    def fetch_matches_by_ids(self, entry_ids: List[int]) -> List[Dict[str, Any]]:
+        """Fetch summary rows for specific entry_ids via the primary key."""
+        result = (
+            self.client.table(self.settings.table_name)
+            .select(SUMMARY_COLUMNS)
+            .in_("entry_id", entry_ids)
+            .execute()
+        )
+        return [_flatten_lookups(row) for row in result.data]
+
+    def fetch_matches_after(self, entry_id: int, limit: int) -> List[Dict[str, Any]]:
+        """Fetch up to ``limit`` full rows with entry_id above a watermark, oldest first."""
+        result = (
+            self.client.table(self.settings.table_name)
+            .select("*, maps(map_name), modes(mode_name)")
+            .gt("entry_id", entry_id)
+            .order("entry_id")
+            .limit(limit)
+            .execute()
+        )
+        return [_flatten_lookups(row) for row in result.data]
+
+    def _summary_rpc(self, function: str, since: Optional[str], until: Optional[str]) -> List[Dict[str, Any]]:
+        return self.client.rpc(function, {"p_since": since, "p_until": until}).execute().data
+
+    def fetch_leaderboard(self, since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per-player matches/wins/losses/win_rate computed by the leaderboard_summary RPC."""
+        return self._summary_rpc("leaderboard_summary", since, until)
+
+    def fetch_mode_summary(self, since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per-mode match counts, average scores and side wins via the mode_summary RPC."""
+        return self._summary_rpc("mode_summary", since, until)
 
+    def fetch_map_summary(self, since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per-map match counts, average scores and side wins via the map_summary RPC."""
+        return self._summary_rpc("map_summary", since, until)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import List
+
 import discord
 
 from discordbot_dev.config import Settings
@@ -72,6 +74,11 @@ class MatchLoggerView(discord.ui.View):
     def _rebuild_items(self) -> None:
         """Rebuild the action rows to stay within Discord's 5-row limit."""
         self.clear_items()
+        # The select objects are reused across refreshes, so re-mark their
+        # defaults from the current state (prefills, mode resets, edits).
+        sync_option_defaults(self.guild_player_select, self.state.guild_players)
+        sync_option_defaults(self.jsoc_player_select, self.state.jsoc_players)
+        sync_option_defaults(self.ffa_player_select, self.state.ffa_players)
         # Core selectors
         self.add_item(self.mode_select)
         self.add_item(self.map_select)
@@ -116,6 +123,12 @@ class MatchLoggerView(discord.ui.View):
         await interaction.response.send_message(f"Match recorded! Dry run: {result.get('dry_run', False)}", ephemeral=True)
 
 
+def sync_option_defaults(select: discord.ui.Select, player_ids: List[int]) -> None:
+    """Mark exactly the options for ``player_ids`` as selected in a roster menu."""
+    for option in select.options:
+        option.default = int(option.value) in player_ids
+
+
 class ModeSelect(discord.ui.Select):
     def __init__(self, view: MatchLoggerView):
         options = [
@@ -124,11 +137,14 @@ class ModeSelect(discord.ui.Select):
         super().__init__(placeholder="Choose Game Mode", min_values=1, max_values=1, options=options)
 
     async def callback(self, interaction: discord.Interaction) -> None:
+        was_free_for_all = self.view.state.is_free_for_all()
         self.view.state.mode_code = self.values[0]
-        # Reset roster selections when switching modes
-        self.view.state.guild_players.clear()
-        self.view.state.jsoc_players.clear()
-        self.view.state.ffa_players.clear()
+        # Reset roster selections when switching between team and FFA layouts;
+        # team picks (e.g. prefilled by /balance) carry over between team modes.
+        if self.view.state.is_free_for_all() != was_free_for_all:
+            self.view.state.guild_players.clear()
+            self.view.state.jsoc_players.clear()
+            self.view.state.ffa_players.clear()
         await self.view.refresh(interaction)
 
 